@@ -12,12 +12,13 @@ from document_worker.worker import DocumentWorker
 def validate_config(ctx, param, value: IO):
     content = value.read()
     parser = DocumentWorkerConfigParser()
-    if not parser.can_read(content):
+    readable, data = parser.can_read(content)
+    if not readable:
         click.echo('Error: Cannot parse config file', err=True)
         exit(1)
 
     try:
-        parser.read_string(content)
+        parser.cfg = data
         parser.validate()
         return parser.config
     except MissingConfigurationError as e:
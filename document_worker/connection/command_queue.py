@@ -2,7 +2,7 @@ import abc
 import logging
 import os
 import platform
-import select
+import selectors
 import signal
 import tenacity
 
@@ -56,12 +56,13 @@ class CommandQueue:
         ctx = Context.get()
         Context.logger.info('Preparing to listen for jobs in command queue')
         queue_conn = ctx.app.db.conn_queue
-        # Prepare file descriptors
-        fds = [queue_conn.connection]
+        # Prepare file descriptors (epoll on Linux)
+        selector = selectors.DefaultSelector()
+        selector.register(queue_conn.connection, selectors.EVENT_READ)
         if IS_LINUX:
-            fds.append(_QUEUE_PIPE_R)
+            selector.register(_QUEUE_PIPE_R, selectors.EVENT_READ)
         # Query queue
-        with queue_conn.new_cursor() as cursor:
+        with selector, queue_conn.new_cursor() as cursor:
             cursor.execute(self.listen_query)
             queue_conn.listening = True
             Context.logger.info('Listening for jobs in command queue')
@@ -80,13 +81,13 @@ class CommandQueue:
                     cursor.execute(self.listen_query)
                     queue_conn.listening = True
 
-                w = select.select(fds, [], [], timeout)
+                events = selector.select(timeout)
 
                 if INTERRUPTED:
                     Context.logger.debug('Interrupt signal received, ending...')
                     break
 
-                if w == ([], [], []):
+                if not events:
                     Context.logger.debug(f'Nothing received in this cycle '
                                          f'(timeout after {timeout} seconds).')
                 else:
@@ -1,17 +1,24 @@
 import dataclasses
 import datetime
+import functools
 import json
 import logging
 import psycopg2  # type: ignore
 import psycopg2.extensions  # type: ignore
 import psycopg2.extras  # type: ignore
 import tenacity
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 from document_worker.config import DatabaseConfig
 from document_worker.consts import DocumentState, NULL_UUID
 from document_worker.context import Context
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 ISOLATION_DEFAULT = psycopg2.extensions.ISOLATION_LEVEL_DEFAULT
 ISOLATION_AUTOCOMMIT = psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
@@ -22,9 +29,62 @@ RETRY_QUERY_TRIES = 3
 RETRY_CONNECT_MULTIPLIER = 0.2
 RETRY_CONNECT_TRIES = 10
 
+# detect dead peers of long-lived (LISTEN) connections early, TCP_NODELAY
+# is already set on TCP sockets by libpq itself
+KEEPALIVE_PARAMS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
+
+def json_loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass  # e.g. integers out of 64-bit range, use stdlib
+    return json.loads(data)
+
+
+def json_dumps(data) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
+# decode json/jsonb columns (template formats, app features, ...) with orjson
+psycopg2.extras.register_default_json(globally=True, loads=json_loads)
+psycopg2.extras.register_default_jsonb(globally=True, loads=json_loads)
+
+
+def retry_query(func):
+    # exponential backoff as tenacity.wait_exponential, without per-call retry state
+    @functools.wraps(func)
+    def retried_query(*args, **kwargs):
+        for attempt in range(1, RETRY_QUERY_TRIES):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                wait = RETRY_QUERY_MULTIPLIER * 2 ** (attempt - 1)
+                Context.logger.debug(f'Query {func.__name__} failed (attempt {attempt}), '
+                                     f'retrying in {wait}s: {e}')
+                time.sleep(wait)
+        return func(*args, **kwargs)
+    return retried_query
+
 
 @dataclasses.dataclass
 class DBDocument:
+    __slots__ = ('uuid', 'name', 'state', 'durability', 'questionnaire_uuid', 'questionnaire_event_uuid',
+                 'questionnaire_replies_hash', 'template_id', 'format_uuid', 'file_name', 'content_type',
+                 'worker_log', 'creator_uuid', 'retrieved_at', 'finished_at', 'created_at', 'app_uuid',
+                 'file_size')
+
     uuid: str
     name: str
     state: str
@@ -47,6 +107,10 @@ class DBDocument:
 
 @dataclasses.dataclass
 class DBTemplate:
+    __slots__ = ('id', 'name', 'organization_id', 'template_id', 'version', 'metamodel_version',
+                 'description', 'readme', 'license', 'allowed_packages', 'recommended_package_id', 'formats',
+                 'created_at', 'app_uuid')
+
     id: str
     name: str
     organization_id: str
@@ -65,6 +129,8 @@ class DBTemplate:
 
 @dataclasses.dataclass
 class DBTemplateFile:
+    __slots__ = ('template_id', 'uuid', 'file_name', 'content', 'app_uuid')
+
     template_id: str
     uuid: str
     file_name: str
@@ -74,6 +140,8 @@ class DBTemplateFile:
 
 @dataclasses.dataclass
 class DBTemplateAsset:
+    __slots__ = ('template_id', 'uuid', 'file_name', 'content_type', 'app_uuid', 'file_size')
+
     template_id: str
     uuid: str
     file_name: str
@@ -84,6 +152,9 @@ class DBTemplateAsset:
 
 @dataclasses.dataclass
 class PersistentCommand:
+    __slots__ = ('uuid', 'state', 'component', 'function', 'body', 'last_error_message', 'attempts',
+                 'max_attempts', 'app_uuid', 'created_by', 'created_at', 'updated_at')
+
     uuid: str
     state: str
     component: str
@@ -104,7 +175,7 @@ class PersistentCommand:
             state=data['state'],
             component=data['component'],
             function=data['function'],
-            body=json.loads(data['body']),
+            body=json_loads(data['body']),
             last_error_message=data['last_error_message'],
             attempts=data['attempts'],
             max_attempts=data['max_attempts'],
@@ -117,6 +188,8 @@ class PersistentCommand:
 
 @dataclasses.dataclass
 class DBAppConfig:
+    __slots__ = ('app_uuid', 'feature')
+
     app_uuid: str
     feature: dict
 
@@ -131,33 +204,84 @@ class DBAppConfig:
 
 @dataclasses.dataclass
 class DBAppLimits:
+    __slots__ = ('app_uuid', 'storage')
+
     app_uuid: str
     storage: Optional[int]
 
 
+def select_columns(record_type, table: str = '') -> str:
+    prefix = f'{table}.' if table else ''
+    return ', '.join(f'{prefix}{field.name}' for field in dataclasses.fields(record_type))
+
+
 def wrap_json_data(data: dict):
-    return psycopg2.extras.Json(data)
+    return psycopg2.extras.Json(data, dumps=json_dumps)
 
 
 class Database:
 
-    SELECT_DOCUMENT = 'SELECT * FROM document WHERE uuid = %s AND app_uuid = %s LIMIT 1;'
-    SELECT_APP_CONFIG = 'SELECT uuid, feature FROM app_config WHERE uuid = %(app_uuid)s LIMIT 1;'
-    SELECT_APP_LIMIT = 'SELECT uuid, storage FROM app_limit WHERE uuid = %(app_uuid)s LIMIT 1;'
-    UPDATE_DOCUMENT_STATE = 'UPDATE document SET state = %s, worker_log = %s WHERE uuid = %s;'
+    # column lists follow the field order of the dataclasses, rows are unpacked positionally
+    DOCUMENT_COLUMNS = select_columns(DBDocument)
+    DOCUMENT_FIELDS = len(dataclasses.fields(DBDocument))
+    TEMPLATE_COLUMNS = select_columns(DBTemplate)
+    TEMPLATE_FILE_COLUMNS = select_columns(DBTemplateFile)
+    TEMPLATE_ASSET_COLUMNS = select_columns(DBTemplateAsset)
+    BUNDLE_FILE = 'file'
+    BUNDLE_ASSET = 'asset'
+
+    # statements prepared once per connection, executed by name
+    PREPARED = {
+        # document with its template (NULLs if the template is gone) in one round trip
+        'dw_select_document': f'SELECT {select_columns(DBDocument, "d")}, '
+                              f'{select_columns(DBTemplate, "t")} '
+                              'FROM document d '
+                              'LEFT JOIN template t ON t.id = d.template_id AND t.app_uuid = d.app_uuid '
+                              'WHERE d.uuid = $1 AND d.app_uuid = $2 LIMIT 1',
+        # app config and limits in one round trip, NULLs where a row is missing
+        'dw_select_app_settings': 'SELECT c.uuid, c.feature, l.uuid, l.storage '
+                                  'FROM (SELECT 1) AS app '
+                                  'LEFT JOIN app_config c ON c.uuid = $1 '
+                                  'LEFT JOIN app_limit l ON l.uuid = $1 '
+                                  'LIMIT 1',
+        'dw_update_document_state': 'UPDATE document SET state = $1, worker_log = $2 WHERE uuid = $3',
+        'dw_update_document_finished': 'UPDATE document SET finished_at = $1, state = $2, '
+                                       'file_name = $3, content_type = $4, worker_log = $5, '
+                                       'file_size = $6 WHERE uuid = $7',
+        'dw_select_template': f'SELECT {TEMPLATE_COLUMNS} FROM template '
+                              'WHERE id = $1 AND app_uuid = $2 LIMIT 1',
+        'dw_select_template_bundle_keys': f"SELECT '{BUNDLE_FILE}', uuid FROM template_file "
+                                          'WHERE template_id = $1 AND app_uuid = $2 '
+                                          'UNION ALL '
+                                          f"SELECT '{BUNDLE_ASSET}', uuid FROM template_asset "
+                                          'WHERE template_id = $1 AND app_uuid = $2',
+        'dw_sum_file_sizes': 'SELECT (SELECT COALESCE(SUM(file_size)::bigint, 0) '
+                             'FROM document WHERE app_uuid = $1) '
+                             '+ (SELECT COALESCE(SUM(file_size)::bigint, 0) '
+                             'FROM template_asset WHERE app_uuid = $1) '
+                             'as result',
+    }
+
+    SELECT_DOCUMENT = 'EXECUTE dw_select_document(%s, %s);'
+    SELECT_APP_SETTINGS = 'EXECUTE dw_select_app_settings(%(app_uuid)s);'
+    UPDATE_DOCUMENT_STATE = 'EXECUTE dw_update_document_state(%s, %s, %s);'
+    # runs on the queue connection, which has no prepared statements
     UPDATE_DOCUMENT_RETRIEVED = 'UPDATE document SET retrieved_at = %s, state = %s WHERE uuid = %s;'
-    UPDATE_DOCUMENT_FINISHED = 'UPDATE document SET finished_at = %s, state = %s, ' \
-                               'file_name = %s, content_type = %s, worker_log = %s, ' \
-                               'file_size = %s WHERE uuid = %s;'
-    SELECT_TEMPLATE = 'SELECT * FROM template WHERE id = %s AND app_uuid = %s LIMIT 1;'
-    SELECT_TEMPLATE_FILES = 'SELECT * FROM template_file WHERE template_id = %s AND app_uuid = %s;'
-    SELECT_TEMPLATE_ASSETS = 'SELECT * FROM template_asset WHERE template_id = %s AND app_uuid = %s;'
-
-    SUM_FILE_SIZES = 'SELECT (SELECT COALESCE(SUM(file_size)::bigint, 0) ' \
-                     'FROM document WHERE app_uuid = %(app_uuid)s) ' \
-                     '+ (SELECT COALESCE(SUM(file_size)::bigint, 0) ' \
-                     'FROM template_asset WHERE app_uuid = %(app_uuid)s) ' \
-                     'as result;'
+    UPDATE_DOCUMENT_FINISHED = 'EXECUTE dw_update_document_finished(%s, %s, %s, %s, %s, %s, %s);'
+    SELECT_TEMPLATE = 'EXECUTE dw_select_template(%s, %s);'
+    SELECT_TEMPLATE_BUNDLE_KEYS = 'EXECUTE dw_select_template_bundle_keys(%s, %s);'
+    # files and assets of a template in one round trip, told apart by the first column;
+    # read through a server-side cursor (cannot DECLARE a prepared statement)
+    SELECT_TEMPLATE_BUNDLE = f"SELECT '{BUNDLE_FILE}', {TEMPLATE_FILE_COLUMNS}, NULL " \
+                             'FROM template_file ' \
+                             'WHERE template_id = %(template_id)s AND app_uuid = %(app_uuid)s ' \
+                             'UNION ALL ' \
+                             f"SELECT '{BUNDLE_ASSET}', {TEMPLATE_ASSET_COLUMNS} " \
+                             'FROM template_asset ' \
+                             'WHERE template_id = %(template_id)s AND app_uuid = %(app_uuid)s;'
+    BUNDLE_ITERSIZE = 256
+
+    SUM_FILE_SIZES = 'EXECUTE dw_sum_file_sizes(%(app_uuid)s);'
 
     def __init__(self, cfg: DatabaseConfig):
         self.cfg = cfg
@@ -167,6 +291,7 @@ class Database:
             dsn=self.cfg.connection_string,
             timeout=self.cfg.connection_timeout,
             autocommit=False,
+            prepared=self.PREPARED,
         )
         self.conn_query.connect()
         Context.logger.info('Preparing PostgreSQL connection for QUEUE')
@@ -183,281 +308,175 @@ class Database:
         self.conn_queue.connect()
 
     @staticmethod
-    def get_as_app_config(result: dict) -> DBAppConfig:
-        return DBAppConfig(
-            app_uuid=result['uuid'],
-            feature=result['feature'],
-        )
+    def get_as_app_config(result: tuple) -> DBAppConfig:
+        return DBAppConfig(*result)
 
     @staticmethod
-    def get_as_app_limits(result: dict) -> DBAppLimits:
-        return DBAppLimits(
-            app_uuid=result['uuid'],
-            storage=result['storage'],
-        )
+    def get_as_app_limits(result: tuple) -> DBAppLimits:
+        return DBAppLimits(*result)
 
     @staticmethod
-    def get_as_document(result: dict) -> DBDocument:
-        return DBDocument(
-            uuid=result['uuid'],
-            name=result['name'],
-            state=result['state'],
-            durability=result['durability'],
-            questionnaire_uuid=result['questionnaire_uuid'],
-            questionnaire_event_uuid=result['questionnaire_event_uuid'],
-            questionnaire_replies_hash=result['questionnaire_replies_hash'],
-            template_id=result['template_id'],
-            format_uuid=result['format_uuid'],
-            creator_uuid=result['creator_uuid'],
-            retrieved_at=result['retrieved_at'],
-            finished_at=result['finished_at'],
-            created_at=result['created_at'],
-            file_name=result['file_name'],
-            content_type=result['content_type'],
-            worker_log=result['worker_log'],
-            app_uuid=result.get('app_uuid', NULL_UUID),
-            file_size=result['file_size'],
-        )
+    def get_as_document(result: tuple) -> DBDocument:
+        return DBDocument(*result)
 
     @staticmethod
-    def get_as_template(result: dict) -> DBTemplate:
-        return DBTemplate(
-            id=result['id'],
-            name=result['name'],
-            organization_id=result['organization_id'],
-            template_id=result['template_id'],
-            version=result['version'],
-            metamodel_version=result['metamodel_version'],
-            description=result['description'],
-            readme=result['readme'],
-            license=result['license'],
-            allowed_packages=result['allowed_packages'],
-            recommended_package_id=result['recommended_package_id'],
-            formats=result['formats'],
-            created_at=result['created_at'],
-            app_uuid=result.get('app_uuid', NULL_UUID),
-        )
+    def get_as_template(result: tuple) -> DBTemplate:
+        return DBTemplate(*result)
 
     @staticmethod
-    def get_as_template_file(result: dict) -> DBTemplateFile:
-        return DBTemplateFile(
-            template_id=result['template_id'],
-            uuid=result['uuid'],
-            file_name=result['file_name'],
-            content=result['content'],
-            app_uuid=result.get('app_uuid', NULL_UUID),
-        )
+    def get_as_template_file(result: tuple) -> DBTemplateFile:
+        return DBTemplateFile(*result)
 
     @staticmethod
-    def get_as_template_asset(result: dict) -> DBTemplateAsset:
-        return DBTemplateAsset(
-            template_id=result['template_id'],
-            uuid=result['uuid'],
-            file_name=result['file_name'],
-            content_type=result['content_type'],
-            app_uuid=result.get('app_uuid', NULL_UUID),
-            file_size=result['file_size'],
+    def get_as_template_asset(result: tuple) -> DBTemplateAsset:
+        return DBTemplateAsset(*result)
+
+    @retry_query
+    def fetch_document(self, document_uuid: str, app_uuid: str) \
+            -> Tuple[Optional[DBDocument], Optional[DBTemplate]]:
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.SELECT_DOCUMENT,
+            vars=(document_uuid, app_uuid),
         )
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
-    def fetch_document(self, document_uuid: str, app_uuid: str) -> Optional[DBDocument]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(
-                query=self.SELECT_DOCUMENT,
-                vars=(document_uuid, app_uuid),
-            )
-            result = cursor.fetchall()
-            if len(result) != 1:
-                return None
-            return self.get_as_document(result[0])
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
-    def fetch_app_config(self, app_uuid: str) -> Optional[DBAppConfig]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(
-                query=self.SELECT_APP_CONFIG,
-                vars={'app_uuid': app_uuid},
-            )
-            result = cursor.fetchall()
-            if len(result) != 1:
-                return None
-            return self.get_as_app_config(result[0])
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
-    def fetch_app_limits(self, app_uuid: str) -> Optional[DBAppLimits]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(
-                query=self.SELECT_APP_LIMIT,
-                vars={'app_uuid': app_uuid},
-            )
-            result = cursor.fetchall()
-            if len(result) != 1:
-                return None
-            return self.get_as_app_limits(result[0])
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+        result = cursor.fetchall()
+        if len(result) != 1:
+            return None, None
+        row = result[0]
+        split = self.DOCUMENT_FIELDS
+        template = None if row[split] is None else self.get_as_template(row[split:])
+        return self.get_as_document(row[:split]), template
+
+    @retry_query
+    def fetch_app_settings(self, app_uuid: str) \
+            -> Tuple[Optional[DBAppConfig], Optional[DBAppLimits]]:
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.SELECT_APP_SETTINGS,
+            vars={'app_uuid': app_uuid},
+        )
+        result = cursor.fetchone()
+        if result is None:
+            return None, None
+        app_config = None if result[0] is None else self.get_as_app_config(result[0:2])
+        app_limits = None if result[2] is None else self.get_as_app_limits(result[2:4])
+        return app_config, app_limits
+
+    @retry_query
     def fetch_template(self, template_id: str, app_uuid: str) -> Optional[DBTemplate]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(
-                query=self.SELECT_TEMPLATE,
-                vars=(template_id, app_uuid),
-            )
-            result = cursor.fetchall()
-            if len(result) != 1:
-                return None
-            return self.get_as_template(result[0])
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
-    def fetch_template_files(self, template_id: str, app_uuid: str) -> List[DBTemplateFile]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(
-                query=self.SELECT_TEMPLATE_FILES,
-                vars=(template_id, app_uuid),
-            )
-            return [self.get_as_template_file(x) for x in cursor.fetchall()]
-
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
-    def fetch_template_assets(self, template_id: str, app_uuid: str) -> List[DBTemplateAsset]:
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.SELECT_TEMPLATE,
+            vars=(template_id, app_uuid),
+        )
+        result = cursor.fetchall()
+        if len(result) != 1:
+            return None
+        return self.get_as_template(result[0])
+
+    @retry_query
+    def fetch_template_bundle(self, template_id: str, app_uuid: str) \
+            -> Tuple[List[DBTemplateFile], List[DBTemplateAsset]]:
+        files = []  # type: List[DBTemplateFile]
+        assets = []  # type: List[DBTemplateAsset]
+        with self.conn_query.new_cursor(name='dw_template_bundle') as cursor:
+            cursor.itersize = self.BUNDLE_ITERSIZE
             cursor.execute(
-                query=self.SELECT_TEMPLATE_ASSETS,
-                vars=(template_id, app_uuid),
+                query=self.SELECT_TEMPLATE_BUNDLE,
+                vars={'template_id': template_id, 'app_uuid': app_uuid},
             )
-            return [self.get_as_template_asset(x) for x in cursor.fetchall()]
+            for row in cursor:
+                if row[0] == self.BUNDLE_FILE:
+                    files.append(self.get_as_template_file(row[1:6]))
+                else:
+                    assets.append(self.get_as_template_asset(row[1:]))
+        return files, assets
+
+    @retry_query
+    def fetch_template_bundle_keys(self, template_id: str, app_uuid: str) \
+            -> Tuple[frozenset[str], frozenset[str]]:
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.SELECT_TEMPLATE_BUNDLE_KEYS,
+            vars=(template_id, app_uuid),
+        )
+        rows = cursor.fetchall()
+        files = frozenset(uuid for kind, uuid in rows if kind == self.BUNDLE_FILE)
+        assets = frozenset(uuid for kind, uuid in rows if kind != self.BUNDLE_FILE)
+        return files, assets
 
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+    @retry_query
     def update_document_state(self, document_uuid: str, worker_log: str, state: str) -> bool:
-        with self.conn_query.new_cursor() as cursor:
-            cursor.execute(
-                query=self.UPDATE_DOCUMENT_STATE,
-                vars=(state, worker_log, document_uuid),
-            )
-            return cursor.rowcount == 1
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.UPDATE_DOCUMENT_STATE,
+            vars=(state, worker_log, document_uuid),
+        )
+        return cursor.rowcount == 1
 
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+    @retry_query
     def update_document_retrieved(self, retrieved_at: datetime.datetime,
                                   document_uuid: str) -> bool:
-        with self.conn_queue.new_cursor() as cursor:
-            cursor.execute(
-                query=self.UPDATE_DOCUMENT_RETRIEVED,
-                vars=(
-                    retrieved_at,
-                    DocumentState.PROCESSING,
-                    document_uuid,
-                ),
-            )
-            return cursor.rowcount == 1
+        cursor = self.conn_queue.cursor
+        cursor.execute(
+            query=self.UPDATE_DOCUMENT_RETRIEVED,
+            vars=(
+                retrieved_at,
+                DocumentState.PROCESSING,
+                document_uuid,
+            ),
+        )
+        return cursor.rowcount == 1
 
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+    @retry_query
     def update_document_finished(
             self, finished_at: datetime.datetime, file_name: str, file_size: int,
             content_type: str,  worker_log: str, document_uuid: str
     ) -> bool:
-        with self.conn_query.new_cursor() as cursor:
-            cursor.execute(
-                query=self.UPDATE_DOCUMENT_FINISHED,
-                vars=(
-                    finished_at,
-                    DocumentState.FINISHED,
-                    file_name,
-                    content_type,
-                    worker_log,
-                    file_size,
-                    document_uuid,
-                ),
-            )
-            return cursor.rowcount == 1
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.UPDATE_DOCUMENT_FINISHED,
+            vars=(
+                finished_at,
+                DocumentState.FINISHED,
+                file_name,
+                content_type,
+                worker_log,
+                file_size,
+                document_uuid,
+            ),
+        )
+        return cursor.rowcount == 1
 
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+    @retry_query
     def get_currently_used_size(self, app_uuid: str):
-        with self.conn_query.new_cursor() as cursor:
-            cursor.execute(
-                query=self.SUM_FILE_SIZES,
-                vars={'app_uuid': app_uuid},
-            )
-            row = cursor.fetchone()
-            return row[0]
+        cursor = self.conn_query.cursor
+        cursor.execute(
+            query=self.SUM_FILE_SIZES,
+            vars={'app_uuid': app_uuid},
+        )
+        row = cursor.fetchone()
+        return row[0]
 
-    @tenacity.retry(
-        reraise=True,
-        wait=tenacity.wait_exponential(multiplier=RETRY_QUERY_MULTIPLIER),
-        stop=tenacity.stop_after_attempt(RETRY_QUERY_TRIES),
-        before=tenacity.before_log(Context.logger, logging.DEBUG),
-        after=tenacity.after_log(Context.logger, logging.DEBUG),
-    )
+    @retry_query
     def execute_query(self, query: str, **kwargs):
-        with self.conn_query.new_cursor(use_dict=True) as cursor:
-            cursor.execute(query=query, vars=kwargs)
+        cursor = self.conn_query.cursor
+        cursor.execute(query=query, vars=kwargs)
 
 
 class PostgresConnection:
 
-    def __init__(self, name: str, dsn: str, timeout=30000, autocommit=False):
+    def __init__(self, name: str, dsn: str, timeout=30000, autocommit=False,
+                 prepared: Optional[dict] = None):
         self.name = name
         self.listening = False
-        self.dsn = psycopg2.extensions.make_dsn(dsn, connect_timeout=timeout)
+        self.dsn = psycopg2.extensions.make_dsn(
+            dsn, connect_timeout=timeout, **KEEPALIVE_PARAMS,
+        )
         self.isolation = ISOLATION_AUTOCOMMIT if autocommit else ISOLATION_DEFAULT
+        self.prepared = prepared or {}
         self._connection = None
+        self._cursor = None
 
     @tenacity.retry(
         reraise=True,
@@ -470,14 +489,13 @@ class PostgresConnection:
         Context.logger.info(f'Creating connection to PostgreSQL database "{self.name}"')
         connection = psycopg2.connect(dsn=self.dsn)
         connection.set_isolation_level(self.isolation)
-        # test connection
         cursor = connection.cursor()
-        cursor.execute(query='SELECT * FROM persistent_command;')
-        result = cursor.fetchall()
-        Context.logger.debug(f'Jobs in queue: {result}')
+        for statement_name, statement in self.prepared.items():
+            cursor.execute(query=f'PREPARE {statement_name} AS {statement};')
         cursor.close()
         connection.commit()
         self._connection = connection
+        self._cursor = None
         self.listening = False
 
     def connect(self):
@@ -489,8 +507,17 @@ class PostgresConnection:
         self.connect()
         return self._connection
 
-    def new_cursor(self, use_dict: bool = False):
+    @property
+    def cursor(self):
+        # shared cursor for short queries, recreated with the connection
+        connection = self.connection
+        if self._cursor is None or self._cursor.closed:
+            self._cursor = connection.cursor()
+        return self._cursor
+
+    def new_cursor(self, use_dict: bool = False, name: Optional[str] = None):
         return self.connection.cursor(
+            name=name,
             cursor_factory=psycopg2.extras.DictCursor if use_dict else None,
         )
 
@@ -503,3 +530,4 @@ class PostgresConnection:
             Context.logger.info(f'Closing connection to PostgreSQL database "{self.name}"')
             self._connection.close()
         self._connection = None
+        self._cursor = None
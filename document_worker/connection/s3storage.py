@@ -1,9 +1,9 @@
-import contextlib
+import io
 import logging
 import minio  # type: ignore
 import minio.error  # type: ignore
 import pathlib
-import tempfile
+import shutil
 import tenacity
 
 from document_worker.config import S3Config
@@ -15,14 +15,10 @@ DOCUMENTS_DIR = 'documents'
 RETRY_S3_MULTIPLIER = 0.5
 RETRY_S3_TRIES = 3
 
-
-@contextlib.contextmanager
-def temp_binary_file(data: bytes):
-    file = tempfile.TemporaryFile()
-    file.write(data)
-    file.seek(0)
-    yield file
-    file.close()
+# S3 limits for a single part, a part as large as the object means a single PUT
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class S3Storage:
@@ -42,6 +38,7 @@ class S3Storage:
             secure=self.cfg.url.startswith('https://'),
             region=self.cfg.region,
         )
+        self._bucket_ready = False
 
     @property
     def identification(self) -> str:
@@ -55,9 +52,12 @@ class S3Storage:
         after=tenacity.after_log(Context.logger, logging.DEBUG),
     )
     def ensure_bucket(self):
+        if self._bucket_ready:
+            return
         found = self.client.bucket_exists(self.cfg.bucket)
         if not found:
             self.client.make_bucket(self.cfg.bucket)
+        self._bucket_ready = True
 
     @tenacity.retry(
         reraise=True,
@@ -71,14 +71,14 @@ class S3Storage:
         object_name = f'{DOCUMENTS_DIR}/{file_name}'
         if Context.get().app.cfg.cloud.multi_tenant:
             object_name = f'{app_uuid}/{object_name}'
-        with temp_binary_file(data=data) as file:
-            self.client.put_object(
-                bucket_name=self.cfg.bucket,
-                object_name=object_name,
-                data=file,
-                length=len(data),
-                content_type=content_type,
-            )
+        self.client.put_object(
+            bucket_name=self.cfg.bucket,
+            object_name=object_name,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+            part_size=min(max(len(data), S3_MIN_PART_SIZE), S3_MAX_PART_SIZE),
+        )
 
     @tenacity.retry(
         reraise=True,
@@ -89,13 +89,21 @@ class S3Storage:
     )
     def download_file(self, file_name: str, target_path: pathlib.Path) -> bool:
         try:
-            self.client.fget_object(
+            response = self.client.get_object(
                 bucket_name=self.cfg.bucket,
                 object_name=file_name,
-                file_path=str(target_path),
             )
         except minio.error.S3Error as e:
             if e.code != 'NoSuchKey':
                 raise e
             return False
+        try:
+            with target_path.open(mode='wb') as file:
+                shutil.copyfileobj(response, file, DOWNLOAD_CHUNK_SIZE)
+        except Exception:
+            target_path.unlink(missing_ok=True)
+            raise
+        finally:
+            response.close()
+            response.release_conn()
         return True
@@ -1,3 +1,5 @@
+import types
+
 DEFAULT_ENCODING = 'utf-8'
 EXIT_SUCCESS = 0
 PACKAGE_VERSION = '3.13.0'
@@ -37,11 +39,11 @@ class DocumentNamingStrategy:
     SLUGIFY = 'slugify'
 
     _DEFAULT = SANITIZE
-    _NAMES = {
+    _NAMES = types.MappingProxyType({
         'uuid': UUID,
         'sanitize': SANITIZE,
         'slugify': SLUGIFY,
-    }
+    })
 
     @classmethod
     def get(cls, name: str):
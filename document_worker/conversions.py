@@ -1,6 +1,11 @@
-import rdflib
+import functools
+import io
+import logging
 import shlex
 import subprocess
+import tempfile
+
+from typing import Tuple
 
 from document_worker.config import DocumentWorkerConfig
 from document_worker.consts import EXIT_SUCCESS, DEFAULT_ENCODING
@@ -8,23 +13,43 @@ from document_worker.context import Context
 from document_worker.documents import FileFormat, FileFormats
 
 
+@functools.lru_cache(maxsize=1024)
+def split_args(args: str) -> Tuple[str, ...]:
+    return tuple(shlex.split(args))
+
+
 def run_conversion(*, args: list, workdir: str, input_data: bytes, name: str,
                    source_format: FileFormat, target_format: FileFormat, timeout=None) -> bytes:
-    command = ' '.join(args)
-    Context.logger.info(f'Calling "{command}" to convert from {source_format} to {target_format}')
-    p = subprocess.Popen(args,
-                         cwd=workdir,
-                         stdin=subprocess.PIPE,
-                         stdout=subprocess.PIPE,
-                         stderr=subprocess.PIPE)
-    stdout, stderr = p.communicate(input=input_data, timeout=timeout)
-    exit_code = p.returncode
-    if exit_code != EXIT_SUCCESS:
-        raise FormatConversionException(
-            name, source_format, target_format,
-            f'Failed to execute (exit code: {exit_code}): {stderr.decode(DEFAULT_ENCODING)}'
-        )
-    return stdout
+    if timeout is not None:
+        timeout = float(timeout)  # YAML may give an int or a numeric string
+    if Context.logger.isEnabledFor(logging.INFO):
+        Context.logger.info('Calling "%s" to convert from %s to %s',
+                            ' '.join(args), source_format, target_format)
+    # output goes to an anonymous file, read back at once instead of pipe-sized chunks
+    with tempfile.TemporaryFile() as output:
+        p = subprocess.Popen(args,
+                             cwd=workdir,
+                             stdin=subprocess.PIPE,
+                             stdout=output,
+                             stderr=subprocess.PIPE)
+        try:
+            _, stderr = p.communicate(input=input_data, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # communicate() leaves the child running, do not leak it
+            p.kill()
+            p.communicate()
+            raise FormatConversionException(
+                name, source_format, target_format,
+                f'Timed out after {timeout} seconds',
+            )
+        exit_code = p.returncode
+        if exit_code != EXIT_SUCCESS:
+            raise FormatConversionException(
+                name, source_format, target_format,
+                f'Failed to execute (exit code: {exit_code}): {stderr.decode(DEFAULT_ENCODING)}'
+            )
+        output.seek(0)
+        return output.read()
 
 
 class FormatConversionException(Exception):
@@ -42,19 +67,23 @@ class FormatConversionException(Exception):
 
 class WkHtmlToPdf:
 
-    ARGS1 = ['--quiet', '--load-error-handling', 'ignore']
-    ARGS2 = ['--encoding', DEFAULT_ENCODING, '-', '-']
+    ARGS1 = ('--quiet', '--load-error-handling', 'ignore')
+    ARGS2 = ('--encoding', DEFAULT_ENCODING, '-', '-')
 
     def __init__(self, config: DocumentWorkerConfig):
         self.config = config
+        self._prefix = tuple(config.wkhtmltopdf.command) + self.ARGS1
+        self._config_args = split_args(config.wkhtmltopdf.args)
 
     def __call__(self, source_format: FileFormat, target_format: FileFormat,
                  data: bytes, metadata: dict, workdir: str) -> bytes:
-        config_args = shlex.split(self.config.wkhtmltopdf.args)
-        template_args = self.extract_template_args(metadata)
-        args_access = ['--disable-local-file-access', '--allow', workdir]
-        args = self.ARGS1 + template_args + config_args + args_access + self.ARGS2
-        command = self.config.wkhtmltopdf.command + args
+        command = [
+            *self._prefix,
+            *self.extract_template_args(metadata),
+            *self._config_args,
+            '--disable-local-file-access', '--allow', workdir,
+            *self.ARGS2,
+        ]
         return run_conversion(
             args=command,
             workdir=workdir,
@@ -66,21 +95,26 @@ class WkHtmlToPdf:
         )
 
     @staticmethod
-    def extract_template_args(metadata: dict):
-        return shlex.split(metadata.get('args', ''))
+    def extract_template_args(metadata: dict) -> Tuple[str, ...]:
+        return split_args(metadata.get('args', ''))
 
 
 class Pandoc:
 
     def __init__(self, config: DocumentWorkerConfig):
         self.config = config
+        self._prefix = tuple(config.pandoc.command)
+        self._config_args = split_args(config.pandoc.args)
 
     def __call__(self, source_format: FileFormat, target_format: FileFormat,
                  data: bytes, metadata: dict, workdir: str) -> bytes:
-        args = ['-f', source_format.name, '-t', target_format.name, '-o', '-']
-        config_args = shlex.split(self.config.pandoc.args)
         template_args = self.extract_template_args(metadata)
-        command = self.config.pandoc.command + template_args + config_args + args
+        command = [
+            *self._prefix,
+            *template_args,
+            *self._config_args,
+            '-f', source_format.name, '-t', target_format.name, '-o', '-',
+        ]
         return run_conversion(
             args=command,
             workdir=workdir,
@@ -92,8 +126,8 @@ class Pandoc:
         )
 
     @staticmethod
-    def extract_template_args(metadata: dict):
-        return shlex.split(metadata.get('args', ''))
+    def extract_template_args(metadata: dict) -> Tuple[str, ...]:
+        return split_args(metadata.get('args', ''))
 
 
 class RdfLibConvert:
@@ -112,8 +146,9 @@ class RdfLibConvert:
 
     def __call__(self, source_format: FileFormat, target_format: FileFormat,
                  data: bytes, metadata: dict) -> bytes:
+        import rdflib  # heavy, imported only by workers converting RDF
         g = rdflib.Graph().parse(
-            data=data.decode(DEFAULT_ENCODING),
+            source=io.BytesIO(data),
             format=self.FORMATS.get(source_format)
         )
         result = g.serialize(
@@ -1,5 +1,9 @@
 import pathvalidate
 import slugify
+import sys
+import types
+
+from typing import Callable, Optional
 
 from document_worker.consts import DEFAULT_ENCODING, DocumentNamingStrategy
 from document_worker.context import Context
@@ -8,16 +12,21 @@ from document_worker.connection.database import DBDocument
 
 class FileFormat:
 
+    __slots__ = ('name', 'content_type', 'file_extension', '_hash')
+
     def __init__(self, name: str, content_type: str, file_extension: str):
-        self.name = name
+        self.name = sys.intern(name)
         self.content_type = content_type
         self.file_extension = file_extension
+        self._hash = hash(self.name)
 
     def __eq__(self, other):
+        if other is self:
+            return True
         return isinstance(other, FileFormat) and other.name == self.name
 
     def __hash__(self):
-        return hash(self.name)
+        return self._hash
 
     def __str__(self):
         return self.name
@@ -57,41 +66,48 @@ class FileFormats:
     JSONLD = FileFormat('jsonld', 'application/ld+json', 'jsonld')
 
     @staticmethod
-    def get(name: str):
-        known_formats = {
-            'html': FileFormats.HTML,
-            'pdf': FileFormats.PDF,
-            'docx': FileFormats.DOCX,
-            'markdown': FileFormats.Markdown,
-            'odt': FileFormats.ODT,
-            'rst': FileFormats.RST,
-            'latex': FileFormats.LaTeX,
-            'json': FileFormats.JSON,
-            'epub': FileFormats.EPUB,
-            'docbook4': FileFormats.DocBook4,
-            'docbook5': FileFormats.DocBook5,
-            'pptx': FileFormats.PPTX,
-            'rtf': FileFormats.RTF,
-            'asciidoc': FileFormats.ADoc,
-            'rdf': FileFormats.RDF_XML,
-            'rdf/xml': FileFormats.RDF_XML,
-            'turtle': FileFormats.TURTLE,
-            'ttl': FileFormats.TURTLE,
-            'n3': FileFormats.N3,
-            'ntriples': FileFormats.NTRIPLES,
-            'n-triples': FileFormats.NTRIPLES,
-            'trig': FileFormats.TRIG,
-            'json-ld': FileFormats.JSONLD,
-            'jsonld': FileFormats.JSONLD,
-        }
-        return known_formats.get(name, None)
+    def get(name: Optional[str]) -> Optional[FileFormat]:
+        if not name:
+            return None
+        return _KNOWN_FORMATS.get(name.lower(), None)
+
+
+_KNOWN_FORMATS = types.MappingProxyType({
+    'html': FileFormats.HTML,
+    'pdf': FileFormats.PDF,
+    'docx': FileFormats.DOCX,
+    'markdown': FileFormats.Markdown,
+    'odt': FileFormats.ODT,
+    'rst': FileFormats.RST,
+    'latex': FileFormats.LaTeX,
+    'json': FileFormats.JSON,
+    'epub': FileFormats.EPUB,
+    'docbook4': FileFormats.DocBook4,
+    'docbook5': FileFormats.DocBook5,
+    'pptx': FileFormats.PPTX,
+    'rtf': FileFormats.RTF,
+    'asciidoc': FileFormats.ADoc,
+    'rdf': FileFormats.RDF_XML,
+    'rdf/xml': FileFormats.RDF_XML,
+    'turtle': FileFormats.TURTLE,
+    'ttl': FileFormats.TURTLE,
+    'n3': FileFormats.N3,
+    'ntriples': FileFormats.NTRIPLES,
+    'n-triples': FileFormats.NTRIPLES,
+    'trig': FileFormats.TRIG,
+    'json-ld': FileFormats.JSONLD,
+    'jsonld': FileFormats.JSONLD,
+})
 
 
 class DocumentFile:
 
+    __slots__ = ('file_format', '_content', 'byte_size', 'encoding', '_ext')
+
     def __init__(self, file_format: FileFormat, content: bytes,
                  encoding: str = DEFAULT_ENCODING):
         self.file_format = file_format
+        self._ext = f'.{file_format.file_extension}'
         self._content = content
         self.byte_size = len(content)
         self.encoding = encoding
@@ -110,7 +126,7 @@ class DocumentFile:
         self.byte_size = len(content)
 
     def filename(self, name: str) -> str:
-        return f'{name}.{self.file_format.file_extension}'
+        return name + self._ext
 
     def store(self, name: str):
         with open(self.filename(name), mode='bw') as f:
@@ -143,10 +159,17 @@ class DocumentNameGiver:
         DocumentNamingStrategy.SANITIZE: _name_sanitize,
         DocumentNamingStrategy.SLUGIFY: _name_slugify,
     }
+    _strategy = None  # type: Optional[Callable[[DBDocument], str]]
+
+    @classmethod
+    def initialize(cls, naming_strategy: str):
+        cls._strategy = cls._STRATEGIES.get(naming_strategy, cls._FALLBACK)
 
     @classmethod
     def name_document(cls, document_metadata: DBDocument,
                       document_file: DocumentFile) -> str:
-        config = Context.get().app.cfg
-        strategy = cls._STRATEGIES.get(config.doc.naming_strategy, cls._FALLBACK)
+        strategy = cls._strategy
+        if strategy is None:
+            config = Context.get().app.cfg
+            strategy = cls._STRATEGIES.get(config.doc.naming_strategy, cls._FALLBACK)
         return document_file.filename(strategy(document_metadata))
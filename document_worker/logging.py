@@ -5,65 +5,65 @@ from typing import Any, Dict
 from document_worker.consts import LOGGER_NAME
 
 
-class DocWorkerLogFilter(logging.Filter):
-    def filter(self, record):
-        if not hasattr(record, 'traceId'):
-            record.traceId = '-'
-        if not hasattr(record, 'documentId'):
-            record.traceId = '-'
-        return True
+_log_context = {
+    'traceId': '-',
+    'documentId': '-',
+}  # type: Dict[str, Any]
+_base_record_factory = logging.getLogRecordFactory()
 
 
-class DocWorkerLogger(logging.Logger):
+def _record_factory(*args, **kwargs) -> logging.LogRecord:
+    # every record (ours and from libraries) carries the current job context
+    record = _base_record_factory(*args, **kwargs)
+    record.__dict__.update(_log_context)
+    return record
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.addFilter(DocWorkerLogFilter())
 
+logging.setLogRecordFactory(_record_factory)
 
-class _DocWorkerLoggerWrapper(logging.Logger):
 
-    ATTR_MAP = {
-        'trace_id': 'traceId',
-        'document_id': 'documentId',
-    }
+class _DocWorkerLoggerWrapper(logging.Logger):
 
     def __init__(self, trace_id: str, document_id: str, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._extra = dict()  # type: Dict[str, Any]
+        self._extra = _log_context
         self._logger = logging.getLogger(LOGGER_NAME)
         self.trace_id = trace_id
         self.document_id = document_id
 
-    def __setattr__(self, name: str, value: Any):
-        if name in self.ATTR_MAP.keys():
-            self._extra[self.ATTR_MAP[name]] = value
-        else:
-            super().__setattr__(name, value)
+    @property
+    def trace_id(self) -> str:
+        return self._extra['traceId']
+
+    @trace_id.setter
+    def trace_id(self, trace_id: str):
+        self._extra['traceId'] = trace_id
+
+    @property
+    def document_id(self) -> str:
+        return self._extra['documentId']
 
-    def __getattr__(self, name: str):
-        if name in self.ATTR_MAP.keys():
-            return self._extra[self.ATTR_MAP[name]]
-        else:
-            return super().__getattribute__(name)
+    @document_id.setter
+    def document_id(self, document_id: str):
+        self._extra['documentId'] = document_id
 
-    def _xlog(self, level: int, message: object, **kwargs):
-        self._logger.log(level=level, msg=message, extra=self._extra, **kwargs)
+    def isEnabledFor(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
 
     def log(self, *args, **kwargs):
-        self._logger.log(*args, extra=self._extra, **kwargs)
+        self._logger.log(*args, **kwargs)
 
     def debug(self, msg: object, *args, **kwargs):
-        self._xlog(level=logging.DEBUG, message=msg, **kwargs)
+        self._logger.debug(msg, *args, **kwargs)
 
     def info(self, msg: object, *args, **kwargs):
-        self._xlog(level=logging.INFO, message=msg, **kwargs)
+        self._logger.info(msg, *args, **kwargs)
 
     def warning(self, msg: object, *args, **kwargs):
-        self._xlog(level=logging.WARNING, message=msg, **kwargs)
+        self._logger.warning(msg, *args, **kwargs)
 
     def error(self, msg: object, *args, **kwargs):
-        self._xlog(level=logging.ERROR, message=msg, **kwargs)
+        self._logger.error(msg, *args, **kwargs)
 
     def set_level(self, level: str):
         self._logger.setLevel(level)
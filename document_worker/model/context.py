@@ -18,7 +18,7 @@ def _load_annotations(annotations: list[dict[str, str]]) -> AnnotationsT:
     for item in annotations:
         key = item.get('key', '')
         value = item.get('value', '')
-        if key in semi_result.keys():
+        if key in semi_result:
             semi_result[key].append(value)
         else:
             semi_result[key] = [value]
@@ -233,7 +233,7 @@ class MetricMeasure:
         self.metric = None  # type: Optional[Metric]
 
     def _resolve_links(self, ctx):
-        if self.metric_uuid in ctx.e.metrics.keys():
+        if self.metric_uuid in ctx.e.metrics:
             self.metric = ctx.e.metrics[self.metric_uuid]
 
     @staticmethod
@@ -357,7 +357,7 @@ class Reply:
 
     def _resolve_links_parent(self, ctx):
         question_uuid = self.fragments[-1]
-        if question_uuid in ctx.e.questions.keys():
+        if question_uuid in ctx.e.questions:
             self.question = ctx.e.questions[question_uuid]
             self.question.replies[self.path] = self
 
@@ -470,7 +470,7 @@ class MultiChoiceReply(Reply):
         super()._resolve_links_parent(ctx)
         self.choices = [ctx.e.choices[key]
                         for key in self.choice_uuids
-                        if key in ctx.e.choices.keys()]
+                        if key in ctx.e.choices]
 
     @staticmethod
     def load(path: str, data: dict, **options):
@@ -549,7 +549,7 @@ class Answer:
     def _resolve_links(self, ctx):
         self.followups = [ctx.e.questions[key]
                           for key in self.followup_uuids
-                          if key in ctx.e.questions.keys()]
+                          if key in ctx.e.questions]
         for followup in self.followups:
             followup.parent = self
             followup._resolve_links(ctx)
@@ -733,7 +733,7 @@ class OptionsQuestion(Question):
         super()._resolve_links_parent(ctx)
         self.answers = [ctx.e.answers[key]
                         for key in self.answer_uuids
-                        if key in ctx.e.answers.keys()]
+                        if key in ctx.e.answers]
         for answer in self.answers:
             answer.parent = self
             answer._resolve_links(ctx)
@@ -768,7 +768,7 @@ class MultiChoiceQuestion(Question):
         super()._resolve_links_parent(ctx)
         self.choices = [ctx.e.choices[key]
                         for key in self.choice_uuids
-                        if key in ctx.e.choices.keys()]
+                        if key in ctx.e.choices]
         for choice in self.choices:
             choice.question = self
 
@@ -802,7 +802,7 @@ class ListQuestion(Question):
         super()._resolve_links_parent(ctx)
         self.followups = [ctx.e.questions[key]
                           for key in self.followup_uuids
-                          if key in ctx.e.questions.keys()]
+                          if key in ctx.e.questions]
         for followup in self.followups:
             followup.parent = self
             followup._resolve_links(ctx)
@@ -877,7 +877,7 @@ class Chapter:
     def _resolve_links(self, ctx):
         self.questions = [ctx.e.questions[key]
                           for key in self.question_uuids
-                          if key in ctx.e.questions.keys()]
+                          if key in ctx.e.questions]
         for question in self.questions:
             question.parent = self
             question._resolve_links(ctx)
@@ -1004,19 +1004,19 @@ class KnowledgeModel:
     def _resolve_links(self, ctx):
         self.chapters = [ctx.e.chapters[key]
                          for key in self.chapter_uuids
-                         if key in ctx.e.chapters.keys()]
+                         if key in ctx.e.chapters]
         self.tags = [ctx.e.tags[key]
                      for key in self.tag_uuids
-                     if key in ctx.e.tags.keys()]
+                     if key in ctx.e.tags]
         self.metrics = [ctx.e.metrics[key]
                         for key in self.metric_uuids
-                        if key in ctx.e.metrics.keys()]
+                        if key in ctx.e.metrics]
         self.phases = [ctx.e.phases[key]
                        for key in self.phase_uuids
-                       if key in ctx.e.phases.keys()]
+                       if key in ctx.e.phases]
         self.integrations = [ctx.e.integrations[key]
                              for key in self.integration_uuids
-                             if key in ctx.e.integrations.keys()]
+                             if key in ctx.e.integrations]
         for index, phase in enumerate(self.phases, start=1):
             phase.order = index
         for chapter in self.chapters:
@@ -1122,6 +1122,9 @@ class RepliesContainer:
     def __len__(self) -> int:
         return len(self.replies)
 
+    def __contains__(self, path: str) -> bool:
+        return path in self.replies
+
     def get(self, path: str, default=None) -> Optional[Reply]:
         return self.replies.get(path, default)
 
@@ -1254,7 +1257,7 @@ class ReportMetric:
         self.metric = None  # type: Optional[Metric]
 
     def _resolve_links(self, ctx):
-        if self.metric_uuid in ctx.e.metrics.keys():
+        if self.metric_uuid in ctx.e.metrics:
             self.metric = ctx.e.metrics[self.metric_uuid]
 
     @staticmethod
@@ -1276,7 +1279,7 @@ class ReportItem:
     def _resolve_links(self, ctx):
         for m in self.metrics:
             m._resolve_links(ctx)
-        if self.chapter_uuid is not None and self.chapter_uuid in ctx.e.chapters.keys():
+        if self.chapter_uuid is not None and self.chapter_uuid in ctx.e.chapters:
             self.chapter = ctx.e.chapters[self.chapter_uuid]
             self.chapter.reports.append(self)
 
@@ -1413,7 +1416,7 @@ class DocumentContext:
 
     def _resolve_links(self):
         phase_uuid = self.questionnaire.phase_uuid
-        if phase_uuid is not None and phase_uuid in self.e.phases.keys():
+        if phase_uuid is not None and phase_uuid in self.e.phases:
             self.current_phase = self.e.phases[phase_uuid]
         self.questionnaire.phase = self.current_phase
         self.km._resolve_links(self)
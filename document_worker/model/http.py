@@ -10,6 +10,9 @@ class RequestsWrapper:
         self.timeout = template_cfg.requests.timeout
         self.request_counter = 0
 
+    def reset(self):
+        self.request_counter = 0
+
     def _prepare_for_request(self):
         self.request_counter += 1
         if self.request_counter > self.limit:
@@ -1,5 +1,6 @@
 import datetime
 import dateutil.parser as dp
+import functools
 import jinja2
 import markupsafe
 import markdown
@@ -36,45 +37,50 @@ _alphabet_size = len(_alphabet)
 _base_jinja_loader = jinja2.BaseLoader()
 _j2_env = _JinjaEnv()
 _empty_dict = dict()  # type: dict[str, Any]
-_romans = [(1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'),
-           (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')]
+_missing = object()
+_roman_hundreds = ('', 'C', 'CC', 'CCC', 'CD', 'D', 'DC', 'DCC', 'DCCC', 'CM')
+_roman_tens = ('', 'X', 'XX', 'XXX', 'XL', 'L', 'LX', 'LXX', 'LXXX', 'XC')
+_roman_units = ('', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX')
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_iso(timestamp: str) -> datetime.datetime:
+    return dp.isoparse(timestamp)
 
 
 def datetime_format(iso_timestamp: Union[None, datetime.datetime, str], fmt: str):
     if iso_timestamp is None:
         return ''
     if not isinstance(iso_timestamp, datetime.datetime):
-        iso_timestamp = dp.isoparse(iso_timestamp)
+        iso_timestamp = _parse_iso(iso_timestamp)
     return iso_timestamp.strftime(fmt)
 
 
 def extract(obj, keys):
-    return [obj[key] for key in keys if key in obj.keys()]
+    return [obj[key] for key in keys if key in obj]
 
 
 def of_alphabet(n: int):
-    result = ''
+    # bijective base-26: 0 -> a, 25 -> z, 26 -> aa, 27 -> ab, ...
+    letters = []
     while n >= 0:
         n, m = divmod(n, _alphabet_size)
-        result = result + _alphabet[m]
-        if n == 0:
-            break
-    return result
+        letters.append(_alphabet[m])
+        n -= 1
+    return ''.join(reversed(letters))
 
 
 def roman(n: int) -> str:
-    result = ''
-    while n > 0:
-        for i, r in _romans:
-            while n >= i:
-                result += r
-                n -= i
-    return result
+    if n <= 0:
+        return ''
+    thousands, n = divmod(n, 1000)
+    hundreds, n = divmod(n, 100)
+    tens, units = divmod(n, 10)
+    return 'M' * thousands + _roman_hundreds[hundreds] + _roman_tens[tens] + _roman_units[units]
 
 
-def xmarkdown(md_text: str):
-    if md_text is None:
-        return ''
+@functools.lru_cache(maxsize=2048)
+def _render_markdown(md_text: str) -> markupsafe.Markup:
     return markupsafe.Markup(markdown.markdown(
         text=md_text,
         extensions=[
@@ -83,51 +89,59 @@ def xmarkdown(md_text: str):
     ))
 
 
+def xmarkdown(md_text: str):
+    if md_text is None:
+        return ''
+    return _render_markdown(md_text)
+
+
 def dot(text: str):
     if text.endswith('.') or len(text.strip()) == 0:
         return text
     return text + '.'
 
 
-def _has_value(reply: dict) -> bool:
-    return bool(reply) and ('value' in reply.keys()) and ('value' in reply['value'].keys())
-
-
 def _get_value(reply: dict) -> Any:
-    return reply['value']['value']
+    try:
+        return reply['value']['value']
+    except (KeyError, TypeError):
+        return _missing
 
 
 def reply_str_value(reply: dict) -> str:
-    if _has_value(reply):
-        return str(_get_value(reply))
-    return ''
+    value = _get_value(reply)
+    if value is _missing:
+        return ''
+    return str(value)
 
 
 def reply_int_value(reply: dict) -> int:
-    if _has_value(reply):
-        return int(_get_value(reply))
-    return 0
+    value = _get_value(reply)
+    if value is _missing:
+        return 0
+    return int(value)
 
 
 def reply_float_value(reply: dict) -> float:
-    if _has_value(reply):
-        return float(_get_value(reply))
-    return 0
+    value = _get_value(reply)
+    if value is _missing:
+        return 0
+    return float(value)
 
 
 def reply_items(reply: dict) -> list:
-    if _has_value(reply) and isinstance(_get_value(reply), list):
-        return _get_value(reply)
+    value = _get_value(reply)
+    if isinstance(value, list):
+        return value
     return []
 
 
 def find_reply(replies, path, xtype='string'):
     if isinstance(path, list):
         path = reply_path(path)
-    reply = replies.get(path, default=None)
-    if not _has_value(reply):
+    r = _get_value(replies.get(path, default=None))
+    if r is _missing:
         return None
-    r = _get_value(reply)
     if xtype == 'int':
         return r if isinstance(r, int) else int(r)
     if xtype == 'float':
@@ -137,10 +151,15 @@ def find_reply(replies, path, xtype='string'):
     return str(r)
 
 
-def reply_path(uuids: list) -> str:
+@functools.lru_cache(maxsize=4096)
+def _reply_path(uuids: tuple) -> str:
     return '.'.join(map(str, uuids))
 
 
+def reply_path(uuids: list) -> str:
+    return _reply_path(tuple(uuids))
+
+
 def jinja2_render(template_str: str, vars=None, fail_safe=False, **kwargs):
     if vars is None:
         vars = _empty_dict
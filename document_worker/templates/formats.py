@@ -7,12 +7,12 @@ from document_worker.templates.steps import create_step, \
 
 class Format:
 
-    FORMAT_META_REQUIRED = [FormatField.UUID,
-                            FormatField.NAME,
-                            FormatField.STEPS]
+    FORMAT_META_REQUIRED = frozenset([FormatField.UUID,
+                                      FormatField.NAME,
+                                      FormatField.STEPS])
 
-    STEP_META_REQUIRED = [StepField.NAME,
-                          StepField.OPTIONS]
+    STEP_META_REQUIRED = frozenset([StepField.NAME,
+                                    StepField.OPTIONS])
 
     def __init__(self, template, metadata: dict):
         self.template = template
@@ -23,16 +23,20 @@ class Format:
         self.steps = self._create_steps(metadata)
         if len(self.steps) < 1:
             self.template.raise_exc(f'Format {self.name} has no steps')
+        self._first_step = self.steps[0]
+        self._next_steps = tuple(self.steps[1:])
 
     def _verify_metadata(self, metadata: dict):
-        for required_field in self.FORMAT_META_REQUIRED:
-            if required_field not in metadata:
-                self.template.raise_exc(f'Missing required field {required_field} for format')
+        missing = self.FORMAT_META_REQUIRED.difference(metadata)
+        if missing:
+            self.template.raise_exc(f'Missing required field {", ".join(sorted(missing))} '
+                                    f'for format')
+        name = metadata[FormatField.NAME]
         for step in metadata[FormatField.STEPS]:
-            for required_field in self.STEP_META_REQUIRED:
-                if required_field not in step:
-                    self.template.raise_exc(f'Missing required field {required_field} '
-                                            f'for step in format "{self.name}"')
+            missing = self.STEP_META_REQUIRED.difference(step)
+            if missing:
+                self.template.raise_exc(f'Missing required field {", ".join(sorted(missing))} '
+                                        f'for step in format "{name}"')
 
     def _create_steps(self, metadata: dict) -> list[Step]:
         steps = []
@@ -58,8 +62,8 @@ class Format:
         return isinstance(self.steps[-1], WkHtmlToPdfStep)
 
     def execute(self, context: dict) -> DocumentFile:
-        result = self.steps[0].execute_first(context)
-        for step in self.steps[1:]:
+        result = self._first_step.execute_first(context)
+        for step in self._next_steps:
             if result is not None:
                 result = step.execute_follow(result)
             else:
@@ -2,6 +2,11 @@ import jinja2
 import jinja2.exceptions
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 from document_worker.consts import DEFAULT_ENCODING
 from document_worker.context import Context
 from document_worker.conversions import Pandoc, WkHtmlToPdf, RdfLibConvert
@@ -38,10 +43,19 @@ class JSONStep(Step):
     NAME = 'json'
     OUTPUT_FORMAT = FileFormats.JSON
 
+    @staticmethod
+    def _dumps(context: dict) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(context, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+            except TypeError:
+                pass  # e.g. integers out of 64-bit range, use stdlib
+        return json.dumps(context, indent=2, sort_keys=True).encode(DEFAULT_ENCODING)
+
     def execute_first(self, context: dict) -> DocumentFile:
         return DocumentFile(
             self.OUTPUT_FORMAT,
-            json.dumps(context, indent=2, sort_keys=True).encode(DEFAULT_ENCODING),
+            self._dumps(context),
             DEFAULT_ENCODING
         )
 
@@ -74,34 +88,13 @@ class Jinja2Step(Step):
 
         self.output_format = FileFormat(self.extension, self.content_type, self.extension)
         try:
-            self.j2_env = jinja2.Environment(
-                loader=jinja2.FileSystemLoader(searchpath=template.template_dir),
-                extensions=['jinja2.ext.do'],
-            )
-            self._add_j2_enhancements()
+            self.j2_env = template.jinja_env
             self.j2_root_template = self.j2_env.get_template(self.root_file)
         except jinja2.exceptions.TemplateSyntaxError as e:
             self.raise_exc(self._jinja_exception_msg(e))
         except Exception as e:
             self.raise_exc(f'Failed loading Jinja2 template: {e}')
 
-    def _add_j2_enhancements(self):
-        from document_worker.templates.filters import filters
-        from document_worker.templates.tests import tests
-        from document_worker.model.http import RequestsWrapper
-        self.j2_env.filters.update(filters)
-        self.j2_env.tests.update(tests)
-        template_cfg = Context.get().app.cfg.templates.get_config(
-            self.template.template_id,
-        )
-        if template_cfg is not None:
-            global_vars = {'secrets': template_cfg.secrets}
-            if template_cfg.requests.enabled:
-                global_vars['requests'] = RequestsWrapper(
-                    template_cfg=template_cfg,
-                )
-            self.j2_env.globals.update(global_vars)
-
     def execute_first(self, context: dict) -> DocumentFile:
         def asset_fetcher(file_name):
             return self.template.fetch_asset(file_name)
@@ -186,9 +179,9 @@ class PandocStep(Step):
         self.input_format = FileFormats.get(options[self.OPTION_FROM])
         self.output_format = FileFormats.get(options[self.OPTION_TO])
         if self.input_format not in self.INPUT_FORMATS:
-            self.raise_exc(f'Unknown input format "{self.input_format.name}"')
+            self.raise_exc(f'Unknown input format "{options[self.OPTION_FROM]}"')
         if self.output_format not in self.OUTPUT_FORMATS:
-            self.raise_exc(f'Unknown output format "{self.output_format.name}"')
+            self.raise_exc(f'Unknown output format "{options[self.OPTION_TO]}"')
 
     def execute_first(self, context: dict) -> DocumentFile:
         return self.raise_exc(f'Step "{self.NAME}" cannot be first')
@@ -209,14 +202,14 @@ class PandocStep(Step):
 class RdfLibConvertStep(Step):
     NAME = 'rdflib-convert'
 
-    INPUT_FORMATS = [
+    INPUT_FORMATS = frozenset([
         FileFormats.RDF_XML,
         FileFormats.N3,
         FileFormats.NTRIPLES,
         FileFormats.TURTLE,
         FileFormats.TRIG,
         FileFormats.JSONLD,
-    ]
+    ])
 
     OUTPUT_FORMATS = INPUT_FORMATS
 
@@ -229,9 +222,9 @@ class RdfLibConvertStep(Step):
         self.input_format = FileFormats.get(options[self.OPTION_FROM])
         self.output_format = FileFormats.get(options[self.OPTION_TO])
         if self.input_format not in self.INPUT_FORMATS:
-            self.raise_exc(f'Unknown input format "{self.input_format.name}"')
+            self.raise_exc(f'Unknown input format "{options[self.OPTION_FROM]}"')
         if self.output_format not in self.OUTPUT_FORMATS:
-            self.raise_exc(f'Unknown output format "{self.output_format.name}"')
+            self.raise_exc(f'Unknown output format "{options[self.OPTION_TO]}"')
 
     def execute_first(self, context: dict) -> DocumentFile:
         return self.raise_exc(f'Step "{self.NAME}" cannot be first')
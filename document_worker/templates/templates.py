@@ -1,5 +1,6 @@
 import base64
 import datetime
+import jinja2
 import pathlib
 import shutil
 
@@ -9,6 +10,7 @@ from document_worker.connection.database import DBTemplate, DBTemplateFile, DBTe
 from document_worker.consts import FormatField
 from document_worker.context import Context
 from document_worker.documents import DocumentFile
+from document_worker.model.http import RequestsWrapper
 from document_worker.templates.formats import Format
 
 
@@ -59,6 +61,9 @@ class Template:
         self.db_template = db_template
         self.template_id = self.db_template.template.id
         self.formats = dict()  # type: dict[str, Format]
+        self._assets_by_name = None  # type: Optional[dict[str, DBTemplateAsset]]
+        self._jinja_env = None  # type: Optional[jinja2.Environment]
+        self.requests = None  # type: Optional[RequestsWrapper]
         self.asset_prefix = f'templates/{self.db_template.template.id}'
         if Context.get().app.cfg.cloud.multi_tenant:
             self.asset_prefix = f'{self.app_uuid}/{self.asset_prefix}'
@@ -66,14 +71,41 @@ class Template:
     def raise_exc(self, message: str):
         raise TemplateException(self.template_id, message)
 
+    @property
+    def jinja_env(self) -> jinja2.Environment:
+        # shared by all Jinja steps of all formats of this template
+        if self._jinja_env is None:
+            self._jinja_env = self._create_jinja_env()
+        return self._jinja_env
+
+    def _create_jinja_env(self) -> jinja2.Environment:
+        from document_worker.templates.filters import filters
+        from document_worker.templates.tests import tests
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(searchpath=self.template_dir),
+            extensions=['jinja2.ext.do'],
+        )
+        env.filters.update(filters)
+        env.tests.update(tests)
+        template_cfg = Context.get().app.cfg.templates.get_config(self.template_id)
+        if template_cfg is not None:
+            global_vars = {'secrets': template_cfg.secrets}
+            if template_cfg.requests.enabled:
+                self.requests = RequestsWrapper(
+                    template_cfg=template_cfg,
+                )
+                global_vars['requests'] = self.requests
+            env.globals.update(global_vars)
+        return env
+
     def fetch_asset(self, file_name: str) -> Optional[Asset]:
         Context.logger.info(f'Fetching asset "{file_name}"')
+        if self._assets_by_name is None:
+            self._assets_by_name = dict()
+            for a in self.db_template.assets.values():
+                self._assets_by_name.setdefault(a.file_name, a)
+        asset = self._assets_by_name.get(file_name, None)
         file_path = self.template_dir / file_name
-        asset = None
-        for a in self.db_template.assets.values():
-            if a.file_name == file_name:
-                asset = a
-                break
         if asset is None or not file_path.exists():
             Context.logger.error(f'Asset "{file_name}" not found')
             return None
@@ -183,8 +215,11 @@ class Template:
         for asset_uuid in to_chk:
             self._update_asset(db_assets[asset_uuid])
         self.db_template.assets = db_assets
+        self._assets_by_name = None
 
     def update_template(self, db_template: TemplateComposite):
+        self.formats.clear()
+        self._jinja_env = None
         self.db_template.template = db_template.template
         if not self.template_dir.exists():
             self.template_dir.mkdir()
@@ -192,6 +227,9 @@ class Template:
         self.update_template_assets(db_template.assets)
 
     def prepare_format(self, format_uuid: str):
+        # steps (Jinja environment, compiled templates) are reused across jobs
+        if format_uuid in self.formats:
+            return True
         for format_meta in self.db_template.template.formats:
             if format_uuid == format_meta.get(FormatField.UUID, None):
                 self.formats[format_uuid] = Format(self, format_meta)
@@ -209,6 +247,9 @@ class Template:
 
     def render(self, format_uuid: str, context: dict) -> DocumentFile:
         self.last_used = datetime.datetime.utcnow()
+        if self.requests is not None:
+            # the environment is reused across jobs, the limit applies per document
+            self.requests.reset()
         return self[format_uuid].execute(context)
 
 
@@ -226,11 +267,11 @@ class TemplateRegistry:
         self._templates = dict()  # type: dict[str, dict[str, Template]]
 
     def has_template(self, app_uuid: str, template_id: str) -> bool:
-        return app_uuid in self._templates.keys() and \
-               template_id in self._templates[app_uuid].keys()
+        return app_uuid in self._templates and \
+               template_id in self._templates[app_uuid]
 
     def _set_template(self, app_uuid: str, template_id: str, template: Template):
-        if app_uuid not in self._templates.keys():
+        if app_uuid not in self._templates:
             self._templates[app_uuid] = dict()
         self._templates[app_uuid][template_id] = template
 
@@ -254,17 +295,36 @@ class TemplateRegistry:
         template = self.get_template(app_uuid, template_id)
         template.update_template(db_template)
 
-    def prepare_template(self, app_uuid: str, template_id: str) -> Template:
+    def _is_up_to_date(self, app_uuid: str, template_id: str,
+                       db_template: DBTemplate) -> bool:
+        if not self.has_template(app_uuid, template_id):
+            return False
+        composite = self.get_template(app_uuid, template_id).db_template
+        if composite.template != db_template:
+            return False
+        # same files and assets (by UUID) as when the template was last prepared
+        file_keys, asset_keys = Context.get().app.db.fetch_template_bundle_keys(
+            template_id=template_id,
+            app_uuid=app_uuid,
+        )
+        return composite.files.keys() == file_keys and \
+            composite.assets.keys() == asset_keys
+
+    def prepare_template(self, app_uuid: str, template_id: str,
+                         db_template: Optional[DBTemplate] = None) -> Template:
         ctx = Context.get()
         query_args = dict(
             template_id=template_id,
             app_uuid=app_uuid,
         )
-        db_template = ctx.app.db.fetch_template(**query_args)
+        if db_template is None:
+            db_template = ctx.app.db.fetch_template(**query_args)
         if db_template is None:
             raise RuntimeError(f'Template {template_id} not found in database')
-        db_files = ctx.app.db.fetch_template_files(**query_args)
-        db_assets = ctx.app.db.fetch_template_assets(**query_args)
+        if self._is_up_to_date(app_uuid, template_id, db_template):
+            Context.logger.info(f'Template {template_id} is up to date, using local copy')
+            return self.get_template(app_uuid, template_id)
+        db_files, db_assets = ctx.app.db.fetch_template_bundle(**query_args)
         template_composite = TemplateComposite(
             db_template=db_template,
             db_files={f.uuid: f for f in db_files},
@@ -11,7 +11,7 @@ from document_worker.config import DocumentWorkerConfig
 from document_worker.connection.command_queue import CommandWorker,\
     CommandQueue
 from document_worker.connection.database import Database,\
-    DBDocument, DBAppConfig, DBAppLimits, PersistentCommand
+    DBDocument, DBTemplate, DBAppConfig, DBAppLimits, PersistentCommand
 from document_worker.connection.s3storage import S3Storage
 from document_worker.connection.sentry import SentryReporter
 from document_worker.consts import DocumentState, NULL_UUID, Queries
@@ -19,7 +19,6 @@ from document_worker.context import Context
 from document_worker.documents import DocumentFile, DocumentNameGiver
 from document_worker.exceptions import create_job_exception, JobException
 from document_worker.limits import LimitsEnforcer
-from document_worker.logging import DocWorkerLogger, DocWorkerLogFilter
 from document_worker.templates import TemplateRegistry
 from document_worker.utils import timeout, JobTimeoutError,\
     PdfWaterMarker, byte_size_format
@@ -50,6 +49,7 @@ class Job:
         self.ctx = Context.get()
         self.log = Context.logger
         self.template = None
+        self.db_template = None  # type: Optional[DBTemplate]
         self.format = None
         self.app_uuid = command.app_uuid
         self.doc_uuid = command.body['uuid']
@@ -64,7 +64,7 @@ class Job:
         if self.app_uuid != NULL_UUID:
             self.log.info(f'Limiting to app with UUID: {self.app_uuid}')
         self.log.info(f'Getting the document "{self.doc_uuid}" details from DB')
-        self.doc = self.ctx.app.db.fetch_document(
+        self.doc, self.db_template = self.ctx.app.db.fetch_document(
             document_uuid=self.doc_uuid,
             app_uuid=self.app_uuid,
         )
@@ -97,13 +97,15 @@ class Job:
         self.template = TemplateRegistry.get().prepare_template(
             app_uuid=self.app_uuid,
             template_id=template_id,
+            db_template=self.db_template,
         )
         # prepare format
         self.template.prepare_format(format_uuid)
         self.format = self.template.formats.get(format_uuid)
         # check limits (PDF-only)
-        self.app_config = self.ctx.app.db.fetch_app_config(app_uuid=self.app_uuid)
-        self.app_limits = self.ctx.app.db.fetch_app_limits(app_uuid=self.app_uuid)
+        self.app_config, self.app_limits = self.ctx.app.db.fetch_app_settings(
+            app_uuid=self.app_uuid,
+        )
         LimitsEnforcer.check_format(
             job_id=self.doc_uuid,
             doc_format=self.format,
@@ -238,6 +240,9 @@ class DocumentWorker(CommandWorker):
             db=Database(cfg=self.config.db),
             s3=S3Storage(cfg=self.config.s3)
         )
+        DocumentNameGiver.initialize(
+            naming_strategy=self.config.doc.naming_strategy,
+        )
         PdfWaterMarker.initialize(
             watermark_filename=self.config.experimental.pdf_watermark,
             watermark_top=self.config.experimental.pdf_watermark_top,
@@ -256,13 +261,6 @@ class DocumentWorker(CommandWorker):
             format=self.config.log.message_format
         )
         Context.logger.set_level(self.config.log.level)
-        log_filter = DocWorkerLogFilter()
-        logging.getLogger().addFilter(filter=log_filter)
-        loggers = (logging.getLogger(n)
-                   for n in logging.root.manager.loggerDict.keys())
-        for logger in loggers:
-            logger.addFilter(filter=log_filter)
-        logging.setLoggerClass(DocWorkerLogger)
 
     def run(self):
         Context.get().app.db.connect()